@@ -1,15 +1,16 @@
 """Analytics API endpoints"""
+import logging
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from typing import Dict, List, Any, Optional
 from supabase import create_client, Client
 from app.config import settings
-from app.services.llm_service import LLMService
-from app.services.analytics.summary_generator import SummaryGenerator
+from app.services.analytics.summary_generator import get_summary_generator
 from app.services.analytics.cache_manager import cache_manager
 from app.api.panoramas import get_supabase_client
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
 
 class SummaryRequest(BaseModel):
@@ -60,14 +61,12 @@ async def get_analytics_summary(
         if not request.panorama.get("name"):
             request.panorama["name"] = panorama_data.get("name", "Event")
         
-        # Initialize services
+        # Get shared services
         try:
-            llm_service = LLMService()
+            summary_generator = get_summary_generator()
         except ValueError as e:
             raise HTTPException(status_code=500, detail=str(e))
         
-        summary_generator = SummaryGenerator(llm_service)
-        
         # Generate summary
         result = await summary_generator.generate_summary(
             panorama=request.panorama,
@@ -91,8 +90,6 @@ async def get_analytics_summary(
     except HTTPException:
         raise
     except Exception as e:
-        print(f"Error generating analytics summary: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error generating analytics summary for panorama %s", panorama_id)
         raise HTTPException(status_code=500, detail=f"Failed to generate summary: {str(e)}")
 
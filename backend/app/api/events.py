@@ -1,3 +1,4 @@
+from datetime import datetime
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from typing import Optional, List, Dict, Any
@@ -189,7 +190,6 @@ async def delete_event(event_id: str):
     try:
         supabase = get_supabase_client()
         
-        from datetime import datetime
         result = supabase.table("events").update({"deleted_at": datetime.utcnow().isoformat()}).eq("id", event_id).execute()
         
         if not result.data or len(result.data) == 0:
@@ -4,7 +4,7 @@ from pydantic import BaseModel
 from typing import Optional, List, Union
 from supabase import create_client, Client
 from app.config import settings
-from app.services.llm_service import LLMService
+from app.services.llm_service import get_llm_service
 from app.services.universal_questions import get_universal_questions
 from app.services.panorama_goals import get_goals_for_type, get_type_description
 import csv
@@ -15,6 +15,10 @@ from datetime import datetime
 
 router = APIRouter()
 
+# Patterns for slug and filename sanitization
+_NON_SLUG_CHARS_RE = re.compile(r'[^\w\s-]')
+_SLUG_SEPARATORS_RE = re.compile(r'[-\s]+')
+
 
 class PanoramaContext(BaseModel):
     """Context for generating panorama from wizard"""
@@ -80,7 +84,7 @@ async def generate_panorama_from_context(
             raise HTTPException(status_code=500, detail=f"Database configuration error: {str(e)}")
         
         try:
-            llm_service = LLMService()
+            llm_service = get_llm_service()
         except ValueError as e:
             print(f"LLM service initialization error: {e}")
             raise HTTPException(status_code=500, detail=str(e))
@@ -140,7 +144,7 @@ async def generate_panorama_from_context(
             }
         
         try:
-            questions = llm_service.generate_survey_questions(context_dict)
+            questions = await llm_service.generate_survey_questions(context_dict)
         except Exception as e:
             print(f"LLM question generation error: {e}")
             import traceback
@@ -323,8 +327,8 @@ def generate_slug(text: str) -> str:
     # Convert to lowercase
     slug = text.lower()
     # Replace spaces and special characters with underscores
-    slug = re.sub(r'[^\w\s-]', '', slug)
-    slug = re.sub(r'[-\s]+', '_', slug)
+    slug = _NON_SLUG_CHARS_RE.sub('', slug)
+    slug = _SLUG_SEPARATORS_RE.sub('_', slug)
     # Remove leading/trailing underscores
     slug = slug.strip('_')
     return slug
@@ -428,8 +432,8 @@ async def export_panorama_csv(panorama_id: str):
             
             output.seek(0)
             # Sanitize panorama name for filename (remove special characters)
-            safe_name = re.sub(r'[^\w\s-]', '', panorama_name).strip()
-            safe_name = re.sub(r'[-\s]+', '_', safe_name)
+            safe_name = _NON_SLUG_CHARS_RE.sub('', panorama_name).strip()
+            safe_name = _SLUG_SEPARATORS_RE.sub('_', safe_name)
             filename = f"{safe_name}_results_{datetime.now().strftime('%Y-%m-%d')}.csv"
             
             return StreamingResponse(
@@ -571,8 +575,8 @@ async def export_panorama_csv(panorama_id: str):
         
         output.seek(0)
         # Sanitize panorama name for filename (remove special characters)
-        safe_name = re.sub(r'[^\w\s-]', '', panorama_name).strip()
-        safe_name = re.sub(r'[-\s]+', '_', safe_name)
+        safe_name = _NON_SLUG_CHARS_RE.sub('', panorama_name).strip()
+        safe_name = _SLUG_SEPARATORS_RE.sub('_', safe_name)
         filename = f"{safe_name}_results_{datetime.now().strftime('%Y-%m-%d')}.csv"
         
         return StreamingResponse(
@@ -656,7 +660,7 @@ async def suggest_context(request: ContextSuggestionsRequest):
         
         # Use LLM to generate suggestions
         try:
-            llm_service = LLMService()
+            llm_service = get_llm_service()
             
             # Create a prompt for context suggestions
             prompt = f"""Based on the following event information, suggest specific questions or areas to cover for a {request.panorama_type} panorama survey.
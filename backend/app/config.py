@@ -12,6 +12,11 @@ class Settings(BaseSettings):
     
     # LLM configuration
     openai_api_key: Optional[str] = None
+    llm_generator_model: str = "gpt-4o"  # Question generation (LLM Call #1)
+    llm_reviewer_model: str = "gpt-4o-mini"  # Validation + refinement (LLM Call #2)
+    # Per-worker OpenAI rate budgets (0 = unlimited); split the account limits across workers
+    llm_requests_per_minute: int = 0
+    llm_tokens_per_minute: int = 0
     
     # Instagram configuration
     instagram_app_id: Optional[str] = None
@@ -20,6 +25,13 @@ class Settings(BaseSettings):
     instagram_webhook_verify_token: Optional[str] = None
     instagram_test_account_id: Optional[str] = None
     
+    # Redis configuration (optional - shares cached LLM results across workers)
+    redis_url: Optional[str] = None
+    
+    # Reuse generated questions for near-identical surveys (costs one embedding call per miss)
+    question_semantic_cache: bool = False
+    question_cache_ttl_seconds: int = 86400
+    
     # API configuration
     api_host: str = "0.0.0.0"
     api_port: int = 8000
@@ -1,11 +1,28 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.api import router as api_router
+from app.services.llm_service import LLMService, close_http_client, warm_openai_connection
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Read prompt templates at startup so the first survey request doesn't hit disk
+    LLMService.reload_prompts()
+    # Handshake with OpenAI in the background so the first request reuses the connection
+    warm_up = asyncio.create_task(warm_openai_connection())
+    yield
+    warm_up.cancel()
+    # Release pooled OpenAI connections
+    await close_http_client()
+
 
 app = FastAPI(
     title="Punter API",
     description="Backend API for Punter application",
-    version="0.1.0"
+    version="0.1.0",
+    lifespan=lifespan
 )
 
 # Configure CORS to allow frontend to communicate with backend
@@ -1,4 +1,5 @@
 """Simple in-memory cache manager for analytics results"""
+from collections import OrderedDict
 from typing import Dict, Optional, Any
 from datetime import datetime, timedelta
 import hashlib
@@ -6,10 +7,12 @@ import json
 
 
 class AnalyticsCacheManager:
-    """Simple in-memory cache for analytics results"""
+    """Simple in-memory LRU cache for analytics results"""
     
-    def __init__(self):
-        self._cache: Dict[str, Dict[str, Any]] = {}
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        # Ordered least- to most-recently used
+        self._cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
     
     def _generate_key(self, panorama_id: str, cache_type: str, response_count: int) -> str:
         """Generate cache key"""
@@ -35,6 +38,7 @@ class AnalyticsCacheManager:
             del self._cache[key]
             return None
         
+        self._cache.move_to_end(key)
         return entry.get('data')
     
     def set(self, panorama_id: str, cache_type: str, response_count: int, data: Any, ttl_seconds: int = 3600):
@@ -47,6 +51,11 @@ class AnalyticsCacheManager:
             'expires_at': datetime.now() + timedelta(seconds=ttl_seconds),
             'created_at': datetime.now()
         }
+        self._cache.move_to_end(key)
+        
+        # Evict least recently used entries once over capacity
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
     
     def clear(self, panorama_id: str, cache_type: Optional[str] = None):
         """Clear cache for panorama (or specific cache type)"""
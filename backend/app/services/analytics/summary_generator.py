@@ -1,18 +1,95 @@
 """Service for generating executive summaries using LLM"""
-import json
+import asyncio
+import functools
+import hashlib
+import logging
 from pathlib import Path
-from typing import Dict, List, Any, Optional
-from app.services.llm_service import LLMService
+from typing import Dict, List, Any, Optional, Set, Tuple
+import orjson
+from redis.exceptions import RedisError
+from app.services.llm_service import (
+    LLM_CALL_TIMEOUT_SECONDS,
+    LLM_MAX_ATTEMPTS,
+    LLM_RETRY_MAX_WAIT_SECONDS,
+    LLMService,
+    get_llm_service,
+)
+
+logger = logging.getLogger(__name__)
+
+
+# Shared (Redis) summary cache settings
+SUMMARY_CACHE_TTL_SECONDS = 3600
+SUMMARY_LOCK_TTL_SECONDS = 30  # Lock expiry if its owner dies; refreshed while the owner works
+SUMMARY_LOCK_REFRESH_SECONDS = 10
+SUMMARY_LOCK_POLL_SECONDS = 0.25
+# Longest a waiter polls for another worker's summary: one LLM call with all its retries
+SUMMARY_LOCK_MAX_WAIT_SECONDS = LLM_MAX_ATTEMPTS * (LLM_CALL_TIMEOUT_SECONDS + LLM_RETRY_MAX_WAIT_SECONDS)
+
+# Summary batching settings
+SUMMARY_BATCH_WINDOW_SECONDS = 0.02  # How long to wait for concurrent requests to join a batch
+SUMMARY_BATCH_MAX_SIZE = 8
+
+# Structured output schema for batched summaries
+SUMMARY_BATCH_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "results": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "id": {"type": "integer"},
+                    "summary": {"type": "string"},
+                    "keyMetrics": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "label": {"type": "string"},
+                                "value": {"type": "string"},
+                                "type": {"type": "string", "enum": ["positive", "negative", "neutral"]},
+                            },
+                            "required": ["label", "value", "type"],
+                            "additionalProperties": False,
+                        },
+                    },
+                },
+                "required": ["id", "summary", "keyMetrics"],
+                "additionalProperties": False,
+            },
+        },
+    },
+    "required": ["results"],
+    "additionalProperties": False,
+}
 
 
 class SummaryGenerator:
     """Generate executive summaries from survey data"""
     
+    # Request settings shared by every call (passed by reference, never mutated)
+    # One model for single and batched summaries, so the result doesn't depend on batching
+    # (gpt-4o also supports the strict json_schema the batch call needs)
+    _MODEL = "gpt-4o"
+    _RESPONSE_FORMAT = {"type": "json_object"}
+    _BATCH_RESPONSE_FORMAT = {
+        "type": "json_schema",
+        "json_schema": {
+            "name": "summaries",
+            "strict": True,
+            "schema": SUMMARY_BATCH_SCHEMA
+        }
+    }
+    
     def __init__(self, llm_service: LLMService):
         self.llm_service = llm_service
         self._prompts_dir = Path(__file__).parent.parent.parent / "prompts"
         self._summary_system_prompt = self._load_prompt("summary_generation_system.txt")
         self._summary_prompt_template = self._load_prompt("summary_generation.txt")
+        self._batch_prompt_template = self._load_prompt("summary_generation_batch.txt")
+        self._batch_item_template = self._load_prompt("summary_generation_batch_item.txt")
+        self._system_message = {"role": "system", "content": self._summary_system_prompt}
     
     def _load_prompt(self, filename: str) -> str:
         """Load prompt template from file"""
@@ -32,6 +109,9 @@ class SummaryGenerator:
         """
         Generate executive summary using LLM.
         
+        When Redis is configured, results are shared across API workers and
+        concurrent requests for the same data wait on a single LLM call.
+        
         Args:
             panorama: Panorama metadata (name, description, etc.)
             questions: List of questions
@@ -45,46 +125,238 @@ class SummaryGenerator:
                 "keyMetrics": List[Dict]  # Key metrics extracted
             }
         """
+        # Nothing for the LLM to summarize - the fallback is as good and free
+        if not self._has_summary_signal(aggregated_stats, text_samples, response_count):
+            return self._get_fallback_summary(panorama, aggregated_stats)
+        
+        redis = self.llm_service.redis
+        if redis is None:
+            result = await summary_batcher.submit(self, {
+                "panorama": panorama,
+                "questions": questions,
+                "aggregated_stats": aggregated_stats,
+                "text_samples": text_samples,
+                "response_count": response_count,
+            })
+            return result or self._get_fallback_summary(panorama, aggregated_stats)
+        
+        key = self._get_cache_key(panorama, questions, aggregated_stats, text_samples, response_count)
+        lock_key = f"{key}:lock"
+        owns_lock = False
+        
+        try:
+            cached = await redis.get(key)
+            if cached:
+                return orjson.loads(cached)
+            
+            # Only one worker calls the LLM per key; peers wait for its result
+            owns_lock = bool(await redis.set(lock_key, "1", nx=True, ex=SUMMARY_LOCK_TTL_SECONDS))
+            if not owns_lock:
+                cached = await self._wait_for_cached_summary(key, lock_key)
+                if cached:
+                    return cached
+        except RedisError as e:
+            logger.warning("Summary cache unavailable: %s", e)
+            redis = None
+        
+        # Keep the lock alive for as long as the LLM call (and its retries) runs
+        lock_refresher = asyncio.create_task(self._refresh_lock(lock_key)) if owns_lock else None
+        try:
+            result = await summary_batcher.submit(self, {
+                "panorama": panorama,
+                "questions": questions,
+                "aggregated_stats": aggregated_stats,
+                "text_samples": text_samples,
+                "response_count": response_count,
+            })
+        finally:
+            if lock_refresher is not None:
+                lock_refresher.cancel()
+        
+        if redis is not None:
+            try:
+                if result:
+                    await redis.set(key, orjson.dumps(result), ex=SUMMARY_CACHE_TTL_SECONDS)
+                if owns_lock:
+                    await redis.delete(lock_key)
+            except RedisError as e:
+                logger.warning("Failed to store summary in cache: %s", e)
+        
+        return result or self._get_fallback_summary(panorama, aggregated_stats)
+    
+    async def generate_summaries(self, batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Generate executive summaries for several panoramas with one LLM call.
+        
+        Args:
+            batch: List of dicts with the generate_summary arguments
+                   (panorama, questions, aggregated_stats, text_samples, response_count)
+        
+        Returns:
+            List of {"summary", "keyMetrics"} dicts in the same order as batch
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(batch)
+        
+        # Only send panoramas with data worth summarizing
+        llm_indexes = [
+            i for i, item in enumerate(batch)
+            if self._has_summary_signal(item["aggregated_stats"], item["text_samples"], item["response_count"])
+        ]
+        for start in range(0, len(llm_indexes), SUMMARY_BATCH_MAX_SIZE):
+            chunk = llm_indexes[start:start + SUMMARY_BATCH_MAX_SIZE]
+            chunk_results = await self._request_summaries([batch[i] for i in chunk])
+            for i, result in zip(chunk, chunk_results):
+                results[i] = result
+        
+        return [
+            result or self._get_fallback_summary(item["panorama"], item["aggregated_stats"])
+            for item, result in zip(batch, results)
+        ]
+    
+    def _has_summary_signal(
+        self,
+        aggregated_stats: Dict[str, Any],
+        text_samples: Dict[str, List[str]],
+        response_count: int
+    ) -> bool:
+        """Check whether there is any data worth sending to the LLM"""
+        if response_count == 0:
+            return False
+        has_text = any(text_samples.values())
+        if not aggregated_stats and not has_text:
+            return False
+        if (
+            aggregated_stats.get("overall_satisfaction") is None
+            and not aggregated_stats.get("top_positive_question")
+            and not aggregated_stats.get("top_negative_question")
+            and not has_text
+        ):
+            return False
+        return True
+    
+    async def _request_summary(
+        self,
+        panorama: Dict[str, Any],
+        questions: List[Dict[str, Any]],
+        aggregated_stats: Dict[str, Any],
+        text_samples: Dict[str, List[str]],
+        response_count: int
+    ) -> Optional[Dict[str, Any]]:
+        """Call the LLM for a summary. Returns None if the LLM fails."""
         try:
             prompt = self._build_prompt(
                 panorama, questions, aggregated_stats, text_samples, response_count
             )
             
-            response = self.llm_service.client.chat.completions.create(
-                model="gpt-4-turbo",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": self._summary_system_prompt
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                response_format={"type": "json_object"},
+            response = await self.llm_service.create_chat_completion(
+                model=self._MODEL,
+                messages=[self._system_message, {"role": "user", "content": prompt}],
+                response_format=self._RESPONSE_FORMAT,
                 temperature=0.7,
                 max_tokens=500
             )
             
             content = response.choices[0].message.content
             if not content:
-                return self._get_fallback_summary(panorama, aggregated_stats)
+                return None
             
             try:
-                result = json.loads(content)
+                result = orjson.loads(content)
                 return {
                     "summary": result.get("summary", ""),
                     "keyMetrics": result.get("keyMetrics", [])
                 }
-            except json.JSONDecodeError:
-                return self._get_fallback_summary(panorama, aggregated_stats)
+            except orjson.JSONDecodeError:
+                return None
                 
-        except Exception as e:
-            print(f"Error generating summary: {e}")
-            import traceback
-            traceback.print_exc()
-            return self._get_fallback_summary(panorama, aggregated_stats)
+        except Exception:
+            logger.exception("Summary generation failed")
+            return None
+    
+    async def _request_summaries(self, items: List[Dict[str, Any]]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Call the LLM once for several summaries.
+        Returns one result per item, None where the LLM failed.
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+        try:
+            surveys = "\n\n".join(
+                self._batch_item_template.format(
+                    survey_id=i,
+                    **self._format_prompt_fields(**item)
+                )
+                for i, item in enumerate(items)
+            )
+            prompt = self._batch_prompt_template.format(surveys=surveys)
+            
+            response = await self.llm_service.create_chat_completion(
+                model=self._MODEL,
+                messages=[self._system_message, {"role": "user", "content": prompt}],
+                response_format=self._BATCH_RESPONSE_FORMAT,
+                temperature=0.7,
+                max_tokens=500 * len(items)
+            )
+            
+            content = response.choices[0].message.content
+            if not content:
+                return results
+            
+            for entry in orjson.loads(content).get("results", []):
+                survey_id = entry.get("id")
+                if isinstance(survey_id, int) and 0 <= survey_id < len(items):
+                    results[survey_id] = {
+                        "summary": entry.get("summary", ""),
+                        "keyMetrics": entry.get("keyMetrics", [])
+                    }
+        except Exception:
+            logger.exception("Batched summary generation failed")
+        
+        return results
+    
+    def _get_cache_key(
+        self,
+        panorama: Dict[str, Any],
+        questions: List[Dict[str, Any]],
+        aggregated_stats: Dict[str, Any],
+        text_samples: Dict[str, List[str]],
+        response_count: int
+    ) -> str:
+        """Build a cache key from everything that feeds the summary prompt"""
+        payload = orjson.dumps(
+            [panorama, questions, aggregated_stats, text_samples, response_count],
+            option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS,
+            default=str
+        )
+        return f"sumgen:{hashlib.blake2b(payload, digest_size=16).hexdigest()}"
+    
+    async def _wait_for_cached_summary(self, key: str, lock_key: str) -> Optional[Dict[str, Any]]:
+        """
+        Poll for a summary being generated by another worker.
+        Gives up as soon as the lock is released without a result (the owner's LLM call failed).
+        """
+        redis = self.llm_service.redis
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + SUMMARY_LOCK_MAX_WAIT_SECONDS
+        while loop.time() < deadline:
+            await asyncio.sleep(SUMMARY_LOCK_POLL_SECONDS)
+            cached = await redis.get(key)
+            if cached:
+                return orjson.loads(cached)
+            if not await redis.exists(lock_key):
+                # The owner may have stored its result just before releasing the lock
+                cached = await redis.get(key)
+                return orjson.loads(cached) if cached else None
+        return None
+    
+    async def _refresh_lock(self, lock_key: str):
+        """Extend a held summary lock until cancelled"""
+        redis = self.llm_service.redis
+        try:
+            while True:
+                await asyncio.sleep(SUMMARY_LOCK_REFRESH_SECONDS)
+                await redis.expire(lock_key, SUMMARY_LOCK_TTL_SECONDS)
+        except RedisError as e:
+            logger.warning("Failed to refresh summary lock: %s", e)
     
     def _build_prompt(
         self,
@@ -95,6 +367,21 @@ class SummaryGenerator:
         response_count: int
     ) -> str:
         """Build prompt for LLM"""
+        return self._summary_prompt_template.format(
+            **self._format_prompt_fields(
+                panorama, questions, aggregated_stats, text_samples, response_count
+            )
+        )
+    
+    def _format_prompt_fields(
+        self,
+        panorama: Dict[str, Any],
+        questions: List[Dict[str, Any]],
+        aggregated_stats: Dict[str, Any],
+        text_samples: Dict[str, List[str]],
+        response_count: int
+    ) -> Dict[str, Any]:
+        """Format survey data into the values used by the summary prompt templates"""
         
         # Extract key statistics
         top_positive = aggregated_stats.get("top_positive_question")
@@ -115,15 +402,14 @@ class SummaryGenerator:
         top_concern_area = self._format_question_summary(top_negative) if top_negative else 'None identified'
         text_response_samples = '\n'.join(text_summary) if text_summary else 'No text responses'
         
-        # Format the template with pre-formatted values
-        return self._summary_prompt_template.format(
-            event_name=panorama.get('name', 'Event'),
-            response_count=response_count,
-            key_statistics=key_statistics,
-            top_positive_area=top_positive_area,
-            top_concern_area=top_concern_area,
-            text_response_samples=text_response_samples
-        )
+        return {
+            "event_name": panorama.get('name', 'Event'),
+            "response_count": response_count,
+            "key_statistics": key_statistics,
+            "top_positive_area": top_positive_area,
+            "top_concern_area": top_concern_area,
+            "text_response_samples": text_response_samples,
+        }
     
     def _format_stats(self, stats: Dict[str, Any]) -> str:
         """Format statistics for prompt"""
@@ -147,7 +433,7 @@ class SummaryGenerator:
     ) -> Dict[str, Any]:
         """Fallback summary if LLM fails"""
         event_name = panorama.get('name', 'this event')
-        satisfaction = aggregated_stats.get('overall_satisfaction', 0)
+        satisfaction = aggregated_stats.get('overall_satisfaction') or 0
         
         if satisfaction > 0.7:
             summary = f"Attendees were very satisfied with {event_name}. The feedback indicates strong positive sentiment overall."
@@ -167,3 +453,78 @@ class SummaryGenerator:
             ]
         }
 
+
+@functools.lru_cache(maxsize=None)
+def get_summary_generator() -> SummaryGenerator:
+    """Get the shared SummaryGenerator (raises ValueError if the LLM is not configured)"""
+    return SummaryGenerator(get_llm_service())
+
+
+class SummaryBatcher:
+    """
+    Coalesce concurrent summary requests into a single batched LLM call.
+    
+    Requests arriving within SUMMARY_BATCH_WINDOW_SECONDS of each other
+    (up to SUMMARY_BATCH_MAX_SIZE) are sent together and the results are
+    fanned back out to each waiting caller.
+    
+    Both paths use the same model, but a lone request still uses the single-summary
+    prompt and JSON mode, while batched requests use the batch prompt and strict
+    schema, so wording can differ slightly depending on concurrent traffic.
+    """
+    
+    def __init__(
+        self,
+        window_seconds: float = SUMMARY_BATCH_WINDOW_SECONDS,
+        max_batch_size: int = SUMMARY_BATCH_MAX_SIZE
+    ):
+        self.window_seconds = window_seconds
+        self.max_batch_size = max_batch_size
+        self._pending: List[Tuple[Dict[str, Any], asyncio.Future]] = []
+        self._flush_timer: Optional[asyncio.TimerHandle] = None
+        # Strong references to running batches (the event loop only keeps weak ones)
+        self._tasks: Set[asyncio.Task] = set()
+    
+    async def submit(self, generator: SummaryGenerator, item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Queue one summary request and wait for its result (None if the LLM failed)"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+        
+        if len(self._pending) >= self.max_batch_size:
+            self._flush(generator)
+        elif self._flush_timer is None:
+            self._flush_timer = loop.call_later(self.window_seconds, self._flush, generator)
+        
+        return await future
+    
+    def _flush(self, generator: SummaryGenerator):
+        """Send all pending requests as one batch"""
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.ensure_future(self._run_batch(generator, batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+    
+    async def _run_batch(self, generator: SummaryGenerator, batch: List[Tuple[Dict[str, Any], asyncio.Future]]):
+        """Run one batch and resolve each caller's future"""
+        items = [item for item, _ in batch]
+        try:
+            if len(items) == 1:
+                results = [await generator._request_summary(**items[0])]
+            else:
+                results = await generator._request_summaries(items)
+        except Exception:
+            logger.exception("Summary batch failed")
+            results = [None] * len(items)
+        
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+
+# Global batcher instance
+summary_batcher = SummaryBatcher()
@@ -1,13 +1,27 @@
-import json
+import asyncio
+import functools
+import hashlib
+import logging
 import re
+import string
+import time
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional, Tuple
 from datetime import datetime
-from openai import OpenAI
+import httpx
+import orjson
+from openai import APIConnectionError, APITimeoutError, AsyncOpenAI, InternalServerError, RateLimitError
+from redis.asyncio import Redis
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential_jitter
 from app.config import settings
-from app.services.universal_questions import get_universal_question_texts
+from app.services.question_cache import QuestionCache
+from app.services.question_coverage import passes_coverage_check
+from app.services.universal_questions import (
+    DEMOGRAPHIC_PHRASES_RE,
+    UNIVERSAL_TEXTS_LOWER,
+    get_universal_question_texts,
+)
 from app.services.question_bank import (
-    get_all_questions,
     get_required_questions,
     format_questions_for_prompt,
 )
@@ -22,30 +36,487 @@ from app.services.question_strategies import (
     format_strategies_for_prompt,
 )
 
+logger = logging.getLogger(__name__)
+
+# Start of the sections array in a streamed response
+_SECTIONS_ARRAY_RE = re.compile(r'"sections"\s*:\s*\[')
+
+PROMPTS_DIR = Path(__file__).parent.parent / "prompts"
+
+def _compile_template(template: str) -> Callable[..., str]:
+    """
+    Parse a str.format template once into literal chunks and field names.
+    The returned function fills the fields without re-parsing the template.
+    """
+    pieces = []  # (text, is_field)
+    for literal, field_name, format_spec, conversion in string.Formatter().parse(template):
+        if literal:
+            pieces.append((literal, False))
+        if field_name is not None:
+            if format_spec or conversion or not field_name.isidentifier():
+                return template.format  # Indexing/format specs: leave to str.format
+            pieces.append((field_name, True))
+    
+    def render(**kwargs) -> str:
+        return "".join([str(kwargs[text]) if is_field else text for text, is_field in pieces])
+    
+    return render
+
+
+# Universal questions are fixed at import, so their prompt section is built once
+_UNIVERSAL_QUESTIONS_SUFFIX = (
+    "\n\nThe following DEMOGRAPHIC questions are automatically included. Do NOT create questions similar to these:\n"
+    + "".join(f"{i}. {q_text}\n" for i, q_text in enumerate(get_universal_question_texts(), 1))
+)
+
+VALID_QUESTION_TYPES = frozenset({"text", "textarea", "Single-select", "Multi-select", "Likert"})
+OPTION_QUESTION_TYPES = frozenset({"Single-select", "Multi-select", "Likert"})
+
+# Strict structured output schemas for generated questions
+_QUESTION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "question_text": {"type": "string"},
+        "question_type": {"type": "string", "enum": ["text", "textarea", "Single-select", "Multi-select", "Likert"]},
+        "options": {"anyOf": [{"type": "array", "items": {"type": "string"}}, {"type": "null"}]},
+        "required": {"type": "boolean"},
+    },
+    "required": ["question_text", "question_type", "options", "required"],
+    "additionalProperties": False,
+}
+_SECTION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "section_name": {"type": "string"},
+        "questions": {"type": "array", "items": _QUESTION_SCHEMA},
+    },
+    "required": ["section_name", "questions"],
+    "additionalProperties": False,
+}
+SURVEY_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "survey",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "sections": {"type": "array", "items": _SECTION_SCHEMA},
+            },
+            "required": ["sections"],
+            "additionalProperties": False,
+        },
+    },
+}
+
+# Function for the combined validation + refinement call
+REVIEW_TOOL = {
+    "type": "function",
+    "function": {
+        "name": "return_survey",
+        "description": "Return the review result, with the corrected survey if validation failed.",
+        "strict": True,
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "validation_passed": {"type": "boolean"},
+                "issues": {"type": "array", "items": {"type": "string"}},
+                "refined_sections": {
+                    "anyOf": [{"type": "array", "items": _SECTION_SCHEMA}, {"type": "null"}]
+                },
+            },
+            "required": ["validation_passed", "issues", "refined_sections"],
+            "additionalProperties": False,
+        },
+    },
+}
+
+# OpenAI call limits (per worker process)
+LLM_MAX_CONCURRENT_CALLS = 8
+LLM_CALL_TIMEOUT_SECONDS = 120  # Long enough for a full 8k-token generation
+LLM_MAX_ATTEMPTS = 4  # Per call, including retries of transient errors
+LLM_RETRY_MAX_WAIT_SECONDS = 30
+
+# Completion budget for survey JSON, sized from the expected question count
+LLM_MAX_COMPLETION_TOKENS = 8192
+COMPLETION_TOKENS_PER_QUESTION = 200  # ~150 tokens/question on average + headroom
+COMPLETION_TOKENS_OVERHEAD = 500  # Section wrappers and, for reviews, the issues list
+
+_llm_call_semaphore = asyncio.Semaphore(LLM_MAX_CONCURRENT_CALLS)
+
+
+class _RateBudget:
+    """
+    Per-minute budget (requests or tokens) refilled continuously, token-bucket style.
+    Callers wait in FIFO order until their cost is available.
+    """
+    
+    def __init__(self, per_minute: int):
+        self.per_minute = per_minute
+        self._available = float(per_minute)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self, cost: int) -> None:
+        """Wait until cost units are available, then consume them"""
+        cost = min(cost, self.per_minute)  # A single oversized call may still go through
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._available = min(
+                    self.per_minute,
+                    self._available + (now - self._updated) * self.per_minute / 60
+                )
+                self._updated = now
+                if self._available >= cost:
+                    self._available -= cost
+                    return
+                await asyncio.sleep((cost - self._available) * 60 / self.per_minute)
+
+
+_request_budget = _RateBudget(settings.llm_requests_per_minute) if settings.llm_requests_per_minute > 0 else None
+_token_budget = _RateBudget(settings.llm_tokens_per_minute) if settings.llm_tokens_per_minute > 0 else None
+
+
+async def _acquire_rate_budget(request: Dict) -> None:
+    """
+    Wait for rate budget before an OpenAI call, so bursts queue locally instead of
+    tripping 429s. Tokens are estimated the way OpenAI counts them against TPM:
+    prompt characters / 4 plus the max_tokens reservation.
+    """
+    if _request_budget is not None:
+        await _request_budget.acquire(1)
+    if _token_budget is not None:
+        prompt_chars = sum(len(m.get("content") or "") for m in request.get("messages", []))
+        await _token_budget.acquire(prompt_chars // 4 + request.get("max_tokens", 0))
+
+
+# Transient OpenAI errors (429s, timeouts, dropped connections, 5xx) worth retrying
+_RETRYABLE_LLM_ERRORS = (RateLimitError, APITimeoutError, APIConnectionError, InternalServerError)
+_llm_retry = retry(
+    retry=retry_if_exception_type(_RETRYABLE_LLM_ERRORS),
+    wait=wait_exponential_jitter(initial=1, max=LLM_RETRY_MAX_WAIT_SECONDS),
+    stop=stop_after_attempt(LLM_MAX_ATTEMPTS),
+    reraise=True,
+)
+
+# Bulk generation: surveys in flight at once (online path) and Batch API polling
+SURVEY_BATCH_MAX_CONCURRENCY = 10
+BATCH_POLL_INTERVAL_SECONDS = 30
+BATCH_TERMINAL_STATUSES = frozenset({"completed", "failed", "expired", "cancelled"})
+
+
+# Shared HTTP client for OpenAI calls (keep-alive + HTTP/2 across the pipeline's calls)
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the shared HTTP client for OpenAI calls, creating it on first use"""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            http2=True,
+            # Keep idle connections well past httpx's 5s default so sparse traffic reuses them
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50, keepalive_expiry=120),
+            timeout=httpx.Timeout(LLM_CALL_TIMEOUT_SECONDS, connect=5)
+        )
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client (called on app shutdown)"""
+    if _http_client is not None:
+        await _http_client.aclose()
+
+
+# Shared Redis client (one connection pool per worker process)
+_redis_client: Optional[Redis] = None
+
+
+def get_redis_client() -> Optional[Redis]:
+    """Get the shared Redis client, or None if Redis is not configured"""
+    global _redis_client
+    if _redis_client is None and settings.redis_url:
+        _redis_client = Redis.from_url(settings.redis_url)
+    return _redis_client
+
+
+# Pre-event appropriate fallback questions (used when the LLM pipeline fails);
+# "{event_name}" is filled in per survey
+_LIKERT_SCALE = ["Strongly Disagree", "Disagree", "Neutral", "Agree", "Strongly Agree"]
+_FALLBACK_QUESTION_TEMPLATES = (
+    # Expectations (3 questions)
+    {
+        "question_text": "What are you most looking forward to at {event_name}?",
+        "question_type": "Multi-select",
+        "options": ["Music performances", "Meeting new people", "Food & drinks", "Overall atmosphere", "Discovering new artists", "Dancing"],
+        "required": True
+    },
+    {
+        "question_text": "How excited are you about attending {event_name}?",
+        "question_type": "Likert",
+        "options": _LIKERT_SCALE,
+        "required": True
+    },
+    {
+        "question_text": "What would make {event_name} a success for you?",
+        "question_type": "textarea",
+        "options": None,
+        "required": False
+    },
+    # Preferences (3 questions)
+    {
+        "question_text": "What music genres are you most interested in?",
+        "question_type": "Multi-select",
+        "options": ["Electronic/Dance", "Hip-Hop/R&B", "Rock/Alternative", "Pop", "Indie", "House/Techno", "Other"],
+        "required": True
+    },
+    {
+        "question_text": "What time of day do you prefer to attend events?",
+        "question_type": "Single-select",
+        "options": ["Morning", "Afternoon", "Evening", "Late Night", "No preference"],
+        "required": False
+    },
+    {
+        "question_text": "How important is the food and beverage selection to your experience?",
+        "question_type": "Likert",
+        "options": _LIKERT_SCALE,
+        "required": False
+    },
+    # Logistics (3 questions)
+    {
+        "question_text": "How are you planning to get to {event_name}?",
+        "question_type": "Single-select",
+        "options": ["Driving myself", "Rideshare (Uber/Lyft)", "Public transport", "Walking/Cycling", "Getting dropped off", "Not sure yet"],
+        "required": True
+    },
+    {
+        "question_text": "What information would be most helpful to receive before the event?",
+        "question_type": "Multi-select",
+        "options": ["Lineup schedule", "Venue map", "Parking details", "Entry procedures", "Food options", "Weather updates"],
+        "required": False
+    },
+    {
+        "question_text": "Will you be attending alone or with others?",
+        "question_type": "Single-select",
+        "options": ["Alone", "With 1 other person", "With a small group (3-5)", "With a large group (6+)"],
+        "required": False
+    },
+    # Marketing (2 questions)
+    {
+        "question_text": "How did you hear about {event_name}?",
+        "question_type": "Single-select",
+        "options": ["Social media", "Friend/Word of mouth", "Email newsletter", "Online ads", "Event listing sites", "Other"],
+        "required": True
+    },
+    {
+        "question_text": "What made you decide to attend?",
+        "question_type": "Multi-select",
+        "options": ["The lineup", "Price/value", "Venue location", "Friend recommendation", "Past experience with organizer", "FOMO"],
+        "required": False
+    },
+    # Pricing (2 questions)
+    {
+        "question_text": "How would you rate the ticket price compared to similar events?",
+        "question_type": "Single-select",
+        "options": ["Much better value", "Slightly better value", "About the same", "Slightly more expensive", "Much more expensive"],
+        "required": False
+    },
+    {
+        "question_text": "What ticket type did you purchase?",
+        "question_type": "Single-select",
+        "options": ["General Admission", "VIP", "Early Bird", "Group Package", "Other"],
+        "required": False
+    },
+)
+
+
+class _SectionStreamParser:
+    """
+    Incrementally parse a streamed {"sections": [...]} response.
+    Each section object is decoded as soon as its closing brace arrives, so parsing
+    overlaps generation and the sections completed before a truncation are kept.
+    """
+    
+    def __init__(self):
+        self.reset()
+    
+    def reset(self) -> None:
+        """Discard everything parsed so far (e.g. before a retried stream)"""
+        self.text = ""
+        self.sections: List[Dict] = []
+        self.done = False  # Closing bracket of the sections array seen
+        self._pos = -1  # Next unscanned index (-1 until the sections array is found)
+        self._depth = 0
+        self._item_start = 0
+        self._in_string = False
+        self._escape = False
+    
+    def feed(self, delta: str) -> None:
+        """Append streamed content and decode any sections it completes"""
+        self.text += delta
+        if self.done:
+            return
+        if self._pos < 0:
+            match = _SECTIONS_ARRAY_RE.search(self.text)
+            if not match:
+                return
+            self._pos = match.end()
+        
+        text = self.text
+        for pos in range(self._pos, len(text)):
+            char = text[pos]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                if self._depth == 0:
+                    self._item_start = pos
+                self._depth += 1
+            elif char in "}]":
+                if self._depth == 0:
+                    self.done = True
+                    return
+                self._depth -= 1
+                if self._depth == 0:
+                    try:
+                        section = orjson.loads(text[self._item_start:pos + 1])
+                    except orjson.JSONDecodeError:
+                        continue
+                    if isinstance(section, dict):
+                        self.sections.append(section)
+        self._pos = len(text)
+
+
+def _format_goals(must_have: List[str], interested: List[str]) -> str:
+    """Format goals by bucket with their question targets"""
+    lines = []
+    if must_have:
+        lines.append("MUST HAVE (need 4 questions each):\n")
+        lines.extend(f"  - {goal}\n" for goal in must_have)
+    if interested:
+        lines.append("INTERESTED TO KNOW (need 2 questions each):\n")
+        lines.extend(f"  - {goal}\n" for goal in interested)
+    return "".join(lines) or "- General pre-event survey"
+
 
 class LLMService:
     """Service for interacting with LLM to generate survey questions"""
     
-    def __init__(self):
+    # Prompt templates, shared by all instances (see reload_prompts)
+    _prompts_loaded = False
+    _question_system_prompt: str
+    _question_context_template: str
+    _review_system_prompt: str
+    _review_context_template: str
+    _question_context_fn: Callable[..., str]
+    _review_context_fn: Callable[..., str]
+    _prompts_digest: str  # Changes whenever any prompt content changes (part of the cache scope)
+    
+    def __init__(
+        self,
+        use_batch_api: bool = False,
+        generator_model: Optional[str] = None,
+        reviewer_model: Optional[str] = None
+    ):
         if not settings.openai_api_key:
             raise ValueError("OPENAI_API_KEY not configured. Please set it in your .env file.")
-        self.client = OpenAI(api_key=settings.openai_api_key)
-        self._prompts_dir = Path(__file__).parent.parent / "prompts"
-        self._question_system_prompt = self._load_prompt("question_generation_system.txt")
-        self._question_prompt_template = self._load_prompt("question_generation.txt")
-        self._validation_prompt_template = self._load_prompt("response_validation.txt")
-        self._refinement_prompt_template = self._load_prompt("response_refinement.txt")
-    
-    def _load_prompt(self, filename: str) -> str:
+        # Retries are handled by _llm_retry, so the SDK's own retries are disabled
+        self.client = AsyncOpenAI(
+            api_key=settings.openai_api_key,
+            http_client=get_http_client(),
+            max_retries=0
+        )
+        self.use_batch_api = use_batch_api  # Route generate_survey_questions_batch through the Batch API
+        # Models per pipeline call (defaults overridable via settings)
+        self.generator_model = generator_model or settings.llm_generator_model
+        self.reviewer_model = reviewer_model or settings.llm_reviewer_model
+        self.redis = get_redis_client()
+        self.question_cache = QuestionCache(
+            self.client,
+            self.redis,
+            semantic=settings.question_semantic_cache,
+            ttl_seconds=settings.question_cache_ttl_seconds
+        )
+        if not LLMService._prompts_loaded:
+            LLMService.reload_prompts()
+    
+    @classmethod
+    def reload_prompts(cls) -> None:
+        """Load prompt templates from disk once for all instances (call again after editing them)"""
+        # Everything static goes in the system messages (instructions, pre-event rules,
+        # universal questions) so the prompt prefix is identical across surveys and
+        # OpenAI can cache it; user messages only carry the per-survey request
+        cls._question_system_prompt = (
+            cls._load_prompt("question_generation_system.txt")
+            + "\n\n" + cls._load_prompt("question_generation.txt")
+            + "\n\n" + format_config_for_prompt()
+            + _UNIVERSAL_QUESTIONS_SUFFIX
+        )
+        cls._question_context_template = cls._load_prompt("question_generation_context.txt")
+        cls._review_system_prompt = cls._load_prompt("response_review.txt")
+        cls._review_context_template = cls._load_prompt("response_review_context.txt")
+        # Pre-parsed templates (staticmethod so they don't bind to instances)
+        cls._question_context_fn = staticmethod(_compile_template(cls._question_context_template))
+        cls._review_context_fn = staticmethod(_compile_template(cls._review_context_template))
+        cls._prompts_digest = hashlib.sha256("\0".join([
+            cls._question_system_prompt,
+            cls._question_context_template,
+            cls._review_system_prompt,
+            cls._review_context_template,
+        ]).encode()).hexdigest()[:16]
+        cls._prompts_loaded = True
+    
+    @staticmethod
+    def _load_prompt(filename: str) -> str:
         """Load prompt template from file"""
-        prompt_path = self._prompts_dir / filename
+        prompt_path = PROMPTS_DIR / filename
         if not prompt_path.exists():
             raise FileNotFoundError(f"Prompt file not found: {prompt_path}")
         return prompt_path.read_text()
     
-    def generate_survey_questions(self, context: Dict[str, str]) -> List[Dict]:
+    @_llm_retry
+    async def create_chat_completion(self, **kwargs):
+        """
+        Call the chat completions API (shared by every OpenAI chat call in the app).
+        Concurrency and rate budgets are capped per worker, each call is bounded by a
+        timeout, and transient errors are retried with jittered exponential backoff.
+        """
+        async with _llm_call_semaphore:
+            await _acquire_rate_budget(kwargs)
+            return await asyncio.wait_for(
+                self.client.chat.completions.create(**kwargs),
+                timeout=LLM_CALL_TIMEOUT_SECONDS
+            )
+    
+    @_llm_retry
+    async def _stream_chat_completion(self, parser: _SectionStreamParser, **kwargs) -> None:
         """
-        Generate survey questions based on event context using streamlined 2-3 LLM call pipeline.
+        Call the chat completions API with streaming, feeding the content into the caller's parser.
+        Same concurrency cap, rate budgets, timeout and retries as create_chat_completion.
+        If the call times out or fails, the sections completed so far stay in the parser;
+        a retried attempt starts the parser over.
+        """
+        async def consume():
+            parser.reset()
+            stream = await self.client.chat.completions.create(stream=True, **kwargs)
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    parser.feed(chunk.choices[0].delta.content)
+        
+        async with _llm_call_semaphore:
+            await _acquire_rate_budget(kwargs)
+            await asyncio.wait_for(consume(), timeout=LLM_CALL_TIMEOUT_SECONDS)
+    
+    async def generate_survey_questions(self, context: Dict[str, str]) -> List[Dict]:
+        """
+        Generate survey questions based on event context using a streamlined 2 LLM call pipeline.
         
         Args:
             context: Dictionary with event information:
@@ -69,50 +540,203 @@ class LLMService:
         try:
             # Step 1: Analyze context (extract focus areas)
             context_analysis = self._analyze_context(context)
+            extracted_data = context_analysis.get("extracted_data", {})
+            
+            # Repeat (or, with the semantic tier, near-identical) surveys skip all LLM calls
+            cache_scope = self._question_cache_scope(context_analysis)
+            cache_text = self._question_cache_text(context_analysis)
+            cached_questions, embedding = await self.question_cache.get(context, cache_text, cache_scope)
+            if cached_questions is not None:
+                logger.debug("Question cache hit")
+                return self._post_process_questions(cached_questions, extracted_data)
             
             # Step 2: Build prompt for question expansion
             prompt = self._build_prompt(context, context_analysis)
             
             # Step 3: LLM Call #1 - Generate questions (expansion + formatting)
-            print("LLM Call #1: Generating questions...")
-            questions_data = self._generate_questions_with_llm(prompt)
+            logger.debug("LLM Call #1: Generating questions...")
+            questions_data = await self._generate_questions_with_llm(prompt, context_analysis)
             
             if not questions_data or not questions_data.get("sections"):
-                print("Failed to generate questions from LLM")
+                logger.warning("Failed to generate questions from LLM")
                 return self._get_fallback_questions(context)
             
-            # Step 4: LLM Call #2 - Validate focus area coverage
-            print("LLM Call #2: Validating questions...")
-            # Pass sections structure so validator can check organization
-            validation_result = self._validate_response(questions_data, context_analysis)
-            
-            # Flatten sections for refinement if needed
+            # Step 4: LLM Call #2 - Validate goal coverage and, if needed, refine in the same call
+            # (skipped when the local coverage check already passes)
             all_questions = self._flatten_sections(questions_data["sections"])
-            
-            # Step 5: LLM Call #3 (if needed) - Refine questions
-            if not validation_result.get("validation_passed", False):
-                print("LLM Call #3: Refining questions based on validation feedback...")
-                questions_data = self._refine_questions(questions_data, validation_result, context_analysis)
-                # Re-flatten after refinement
+            if self._passes_local_review(all_questions, context_analysis):
+                logger.debug("Local coverage check passed, skipping LLM review")
+                reviewed = True
+            else:
+                logger.debug("LLM Call #2: Reviewing questions...")
+                questions_data, reviewed = await self._review_questions(questions_data, context_analysis)
                 all_questions = self._flatten_sections(questions_data.get("sections", []))
             
-            # Step 6: Validate and normalize questions
+            # Step 5: Validate and normalize questions
             validated_questions = self._validate_questions(all_questions)
+            # Only cache surveys that were checked and are within the survey size bounds, so a
+            # failed review or a degenerate result is regenerated next time rather than served.
+            # Cache before placeholder replacement so hits are re-filled from their own event data
+            constraints = get_survey_constraints()
+            if reviewed and constraints["min_questions"] <= len(validated_questions) <= constraints["max_questions"]:
+                await self.question_cache.set(context, cache_text, cache_scope, validated_questions, embedding)
             
-            # Step 7: GUARANTEED post-processing - replace placeholder tokens with real data
-            print("Post-processing: Replacing placeholder tokens with real data...")
-            extracted_data = context_analysis.get("extracted_data", {})
-            final_questions = self._post_process_questions(validated_questions, extracted_data)
-            
-            return final_questions
+            # Step 6: GUARANTEED post-processing - replace placeholder tokens with real data
+            logger.debug("Post-processing: Replacing placeholder tokens with real data...")
+            return self._post_process_questions(validated_questions, extracted_data)
             
-        except Exception as e:
-            print(f"Error generating questions: {e}")
-            import traceback
-            traceback.print_exc()
+        except Exception:
+            logger.exception("Error generating questions")
             # Return fallback questions
             return self._get_fallback_questions(context)
     
+    def _question_cache_scope(self, context_analysis: Dict) -> str:
+        """
+        Cache scope: only surveys for the same event type and event data may share questions,
+        since the LLM can write event details into question text verbatim. The models and
+        prompt content are included so changing either stops serving older surveys.
+        """
+        return orjson.dumps(
+            [
+                self._prompts_digest,
+                self.generator_model,
+                self.reviewer_model,
+                context_analysis.get("event_type", ""),
+                context_analysis.get("extracted_data", {}),
+            ],
+            option=orjson.OPT_SORT_KEYS,
+            default=str
+        ).decode()
+    
+    def _question_cache_text(self, context_analysis: Dict) -> str:
+        """
+        Cache text: the parts of the context that vary in wording (normalized by the cache).
+        Goals are sorted since their order doesn't change which questions are needed.
+        """
+        return "\n".join([
+            f"Audience: {context_analysis.get('audience', '')}",
+            f"Timing: {context_analysis.get('timing', '')}",
+            f"Must have: {'; '.join(sorted(context_analysis.get('must_have_goals', [])))}",
+            f"Interested: {'; '.join(sorted(context_analysis.get('interested_goals', [])))}",
+            f"Additional context: {context_analysis.get('additional_context', '')}",
+        ])
+    
+    def _finalize_questions(self, all_questions: List[Dict], context_analysis: Dict) -> List[Dict]:
+        """Validate and normalize questions, then replace placeholder tokens with real data"""
+        # Step 5: Validate and normalize questions
+        validated_questions = self._validate_questions(all_questions)
+        
+        # Step 6: GUARANTEED post-processing - replace placeholder tokens with real data
+        logger.debug("Post-processing: Replacing placeholder tokens with real data...")
+        extracted_data = context_analysis.get("extracted_data", {})
+        return self._post_process_questions(validated_questions, extracted_data)
+    
+    async def generate_survey_questions_batch(self, contexts: List[Dict]) -> List[List[Dict]]:
+        """
+        Generate survey questions for many events at once (e.g. nightly jobs).
+        With use_batch_api, each LLM call stage is submitted as a single OpenAI Batch API
+        job (half price, separate rate limits, results within the 24h window); otherwise
+        the contexts run through the online pipeline concurrently.
+        Returns one question list per context, in input order.
+        """
+        if not self.use_batch_api:
+            # Bound how many surveys are in flight; LLM calls are also capped per worker
+            semaphore = asyncio.Semaphore(SURVEY_BATCH_MAX_CONCURRENCY)
+            
+            async def generate(context: Dict) -> List[Dict]:
+                async with semaphore:
+                    return await self.generate_survey_questions(context)
+            
+            return list(await asyncio.gather(*(generate(c) for c in contexts)))
+        
+        analyses = [self._analyze_context(context) for context in contexts]
+        questions_data: Dict[int, Dict] = {}
+        generated: List[int] = []
+        try:
+            # Stage 1: LLM Call #1 - Generate questions for every context
+            outputs = await self._run_batch({
+                str(i): self._generation_request(self._build_prompt(context, analyses[i]), analyses[i])
+                for i, context in enumerate(contexts)
+            })
+            for i in range(len(contexts)):
+                questions_data[i] = self._parse_generation_content((outputs.get(str(i)) or {}).get("content"))
+            generated = [i for i in range(len(contexts)) if questions_data[i].get("sections")]
+            
+            # Stage 2: LLM Call #2 - Review (validate + refine) what the local check can't pass
+            to_review = [
+                i for i in generated
+                if not self._passes_local_review(self._flatten_sections(questions_data[i]["sections"]), analyses[i])
+            ]
+            outputs = await self._run_batch({
+                str(i): self._review_request(questions_data[i], analyses[i]) for i in to_review
+            })
+            for i in to_review:
+                message = outputs.get(str(i)) or {}
+                tool_calls = message.get("tool_calls") or []
+                arguments = tool_calls[0]["function"]["arguments"] if tool_calls else None
+                questions_data[i], _ = self._parse_review_arguments(arguments, questions_data[i])
+        except Exception:
+            logger.exception("Error in batch question generation")
+            return [self._get_fallback_questions(context) for context in contexts]
+        
+        results = []
+        for i, context in enumerate(contexts):
+            if i not in generated:
+                logger.warning("Failed to generate questions from LLM for batch item %s", i)
+                results.append(self._get_fallback_questions(context))
+                continue
+            try:
+                all_questions = self._flatten_sections(questions_data[i].get("sections", []))
+                results.append(self._finalize_questions(all_questions, analyses[i]))
+            except Exception:
+                logger.exception("Error finalizing batch item %s", i)
+                results.append(self._get_fallback_questions(context))
+        return results
+    
+    async def _run_batch(self, requests: Dict[str, Dict]) -> Dict[str, Dict]:
+        """
+        Submit chat completion requests as one Batch API job and wait for it to finish.
+        Returns the response message dicts keyed by custom_id; failed requests are left out.
+        """
+        if not requests:
+            return {}
+        
+        lines = [
+            orjson.dumps({"custom_id": custom_id, "method": "POST", "url": "/v1/chat/completions", "body": body})
+            for custom_id, body in requests.items()
+        ]
+        input_file = await self.client.files.create(
+            file=("survey_generation_batch.jsonl", b"\n".join(lines)),
+            purpose="batch"
+        )
+        batch = await self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        logger.info("Submitted batch %s with %s requests", batch.id, len(lines))
+        
+        while batch.status not in BATCH_TERMINAL_STATUSES:
+            await asyncio.sleep(BATCH_POLL_INTERVAL_SECONDS)
+            batch = await self.client.batches.retrieve(batch.id)
+        if batch.status != "completed":
+            raise RuntimeError(f"Batch {batch.id} ended with status {batch.status}")
+        if not batch.output_file_id:
+            return {}
+        
+        output = await self.client.files.content(batch.output_file_id)
+        results = {}
+        for line in output.text.splitlines():
+            if not line.strip():
+                continue
+            item = orjson.loads(line)
+            response = item.get("response") or {}
+            if response.get("status_code") != 200:
+                logger.warning("Batch request %s failed: %s", item.get("custom_id"), item.get("error"))
+                continue
+            results[item["custom_id"]] = response["body"]["choices"][0]["message"]
+        return results
+    
     def _analyze_context(self, context: Dict[str, str]) -> Dict:
         """
         Analyze context to extract goals, event data, and prepare for question generation.
@@ -134,20 +758,13 @@ class LLMService:
         target_count = max(survey_constraints["min_questions"], 
                          min(target_count, survey_constraints["max_questions"]))
         
-        # Load question bank examples and required questions
-        question_bank_examples = get_all_questions()
+        # Load required questions
         required_questions = get_required_questions()
         event_name = context.get("event_name", "the event")
         
-        # Format question bank for prompt
-        question_bank_prompt = format_questions_for_prompt(question_bank_examples, event_name)
-        
         # Format required questions for prompt
         required_questions_prompt = format_questions_for_prompt(required_questions, event_name)
         
-        # Get pre-event rules for prompt
-        pre_event_rules = format_config_for_prompt()
-        
         # additional_context is for customization only
         additional_context = context.get("additional_context", "")
         
@@ -228,6 +845,9 @@ class LLMService:
             goal_strategies, extracted_data, must_have_goals, interested_goals
         )
         
+        # Goals by bucket for the review prompt (formatted once per context)
+        goals_text = _format_goals(must_have_goals, interested_goals)
+        
         return {
             "additional_context": additional_context,
             "event_type": context.get("event_type", ""),
@@ -237,13 +857,11 @@ class LLMService:
             # Bucket goals
             "must_have_goals": must_have_goals,
             "interested_goals": interested_goals,
+            "goals_text": goals_text,
             "target_question_count": target_count,
             # Question bank data
-            "question_bank_prompt": question_bank_prompt,
             "required_questions_prompt": required_questions_prompt,
             "required_questions": required_questions,
-            # Pre-event rules
-            "pre_event_rules": pre_event_rules,
             # NEW: Event data for placeholders
             "available_data": available_data,
             "extracted_data": extracted_data,
@@ -257,11 +875,9 @@ class LLMService:
         # Get strategy instructions (contains all goal-strategy mappings with tokens)
         strategy_instructions = context_analysis.get("strategy_instructions", "")
         
-        # Get extracted data for preview in prompt
-        extracted_data = context_analysis.get("extracted_data", {})
-        
-        # Format the template with context variables
-        prompt = self._question_prompt_template.format(
+        # Static instructions, pre-event rules and universal questions live in the system prompt;
+        # the user prompt is only the per-survey request
+        prompt = self._question_context_fn(
             focus_areas=strategy_instructions,
             event_type=context_analysis.get('event_type', 'Music Festival'),
             event_name=context_analysis.get('event_name', 'Untitled Event'),
@@ -270,52 +886,76 @@ class LLMService:
             additional_context=context_analysis.get('additional_context', 'None')
         )
         
-        # Add pre-event rules (forbidden patterns, constraints)
-        pre_event_rules = context_analysis.get("pre_event_rules", "")
-        if pre_event_rules:
-            prompt += f"\n\n{pre_event_rules}"
-        
         # Add required questions that MUST be included
         required_questions_prompt = context_analysis.get("required_questions_prompt", "")
-        if required_questions_prompt:
-            prompt += "\n\nREQUIRED QUESTIONS (must include these in every survey):\n"
-            prompt += required_questions_prompt
-        
-        # Dynamically append universal questions list (demographics - already collected)
-        universal_question_texts = get_universal_question_texts()
-        prompt += "\n\nThe following DEMOGRAPHIC questions are automatically included. Do NOT create questions similar to these:\n"
-        for i, q_text in enumerate(universal_question_texts, 1):
-            prompt += f"{i}. {q_text}\n"
-        
-        return prompt
+        if not required_questions_prompt:
+            return prompt
+        return "".join([
+            prompt,
+            "\nREQUIRED QUESTIONS (must include these in every survey):\n",
+            required_questions_prompt,
+        ])
+    
+    def _max_completion_tokens(self, context_analysis: Dict) -> int:
+        """Completion token ceiling for a full survey (target questions plus required ones)"""
+        question_count = (
+            context_analysis.get("target_question_count", 0)
+            + len(context_analysis.get("required_questions", []))
+        )
+        return min(
+            LLM_MAX_COMPLETION_TOKENS,
+            question_count * COMPLETION_TOKENS_PER_QUESTION + COMPLETION_TOKENS_OVERHEAD
+        )
+    
+    def _generation_request(self, prompt: str, context_analysis: Dict) -> Dict:
+        """Build chat completion params for question generation (LLM Call #1)"""
+        return {
+            "model": self.generator_model,
+            "messages": [
+                {
+                    "role": "system",
+                    "content": self._question_system_prompt
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            "response_format": SURVEY_RESPONSE_FORMAT,
+            "temperature": 0.7,
+            "max_tokens": self._max_completion_tokens(context_analysis)
+        }
     
-    def _generate_questions_with_llm(self, prompt: str) -> Dict:
+    def _parse_generation_content(self, content: Optional[str]) -> Dict:
+        """Parse question generation output into the sections structure"""
+        if not content:
+            return {"sections": []}
+        return self._parse_response(content)
+    
+    async def _generate_questions_with_llm(self, prompt: str, context_analysis: Dict) -> Dict:
         """Generate questions using LLM (LLM Call #1) - returns sections structure"""
+        request = self._generation_request(prompt, context_analysis)
+        parser = _SectionStreamParser()
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-4o",  # Upgraded for better reasoning and instruction following
-                messages=[
-                    {
-                        "role": "system",
-                        "content": self._question_system_prompt
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                response_format={"type": "json_object"},
-                temperature=0.7,
-                max_tokens=8192  # Increased for questions with sections: ~150 tokens/question × 30 = 4500 + buffer
-            )
-            
-            content = response.choices[0].message.content
-            if not content:
-                return {"sections": []}
-            
-            return self._parse_response(content)
+            await self._stream_chat_completion(parser, **request)
+            if parser.done:
+                return {"sections": parser.sections}
+            return self._parse_generation_content(parser.text)
+        except _RETRYABLE_LLM_ERRORS + (asyncio.TimeoutError,) as e:
+            logger.warning("Error in question generation LLM call: %s", e)
+            if parser.sections:
+                # Timed out or failed mid-stream: keep the sections that completed
+                logger.warning("Generation stream ended early; keeping %s complete sections", len(parser.sections))
+                return {"sections": parser.sections}
+            return {"sections": []}
         except Exception as e:
-            print(f"Error in question generation LLM call: {e}")
+            logger.warning("Streaming question generation failed, retrying without streaming: %s", e)
+        
+        try:
+            response = await self.create_chat_completion(**request)
+            return self._parse_generation_content(response.choices[0].message.content)
+        except Exception as e:
+            logger.warning("Error in question generation LLM call: %s", e)
             return {"sections": []}
     
     def _flatten_sections(self, sections: List[Dict]) -> List[Dict]:
@@ -326,202 +966,111 @@ class LLMService:
             all_questions.extend(questions)
         return all_questions
     
-    def _validate_response(self, questions_data: Dict, context_analysis: Dict) -> Dict:
-        """Validate generated questions using LLM (LLM Call #2)"""
+    def _review_request(self, questions_data: Dict, context_analysis: Dict) -> Dict:
+        """Build chat completion params for the combined validation + refinement call (LLM Call #2)"""
+        # Format questions for review prompt (sections structure)
+        questions_json = orjson.dumps(questions_data).decode()
+        
+        # Build review prompt (criteria and instructions are in the system prompt)
+        review_prompt = self._review_context_fn(
+            user_focus_areas=context_analysis.get("goals_text", ""),
+            generated_questions=questions_json
+        )
+        
+        return {
+            "model": self.reviewer_model,
+            "messages": [
+                {
+                    "role": "system",
+                    "content": self._review_system_prompt
+                },
+                {
+                    "role": "user",
+                    "content": review_prompt
+                }
+            ],
+            "tools": [REVIEW_TOOL],
+            "tool_choice": {"type": "function", "function": {"name": "return_survey"}},
+            "temperature": 0.3,
+            "max_tokens": self._max_completion_tokens(context_analysis)  # Room for a full refined survey
+        }
+    
+    def _parse_review_arguments(self, arguments: Optional[str], questions_data: Dict) -> Tuple[Dict, bool]:
+        """
+        Parse return_survey arguments, keeping the original questions unless a refinement is usable.
+        Returns (questions_data, reviewed); reviewed is False when the review gave no usable verdict.
+        """
+        if not arguments:
+            return questions_data, False  # Default to pass if the review fails
         try:
-            # Format questions for validation prompt (can be sections structure or flat list)
-            questions_json = json.dumps(questions_data, indent=2)
-            
-            # Format goals by bucket for validation
-            must_have = context_analysis.get("must_have_goals", [])
-            interested = context_analysis.get("interested_goals", [])
-            
-            goals_text = ""
-            if must_have:
-                goals_text += "MUST HAVE (need 4 questions each):\n"
-                for goal in must_have:
-                    goals_text += f"  - {goal}\n"
-            if interested:
-                goals_text += "INTERESTED TO KNOW (need 2 questions each):\n"
-                for goal in interested:
-                    goals_text += f"  - {goal}\n"
-            if not goals_text:
-                goals_text = "- General pre-event survey"
-            
-            # Build validation prompt
-            validation_prompt = self._validation_prompt_template.format(
-                user_focus_areas=goals_text,
-                generated_questions=questions_json
-            )
-            
-            response = self.client.chat.completions.create(
-                model="gpt-4o",  # Upgraded for better reasoning in validation
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a quality assurance expert for survey question generation. Analyze questions and provide structured validation feedback in JSON format."
-                    },
-                    {
-                        "role": "user",
-                        "content": validation_prompt
-                    }
-                ],
-                response_format={"type": "json_object"},
-                temperature=0.3,
-                max_tokens=2000
-            )
-            
-            content = response.choices[0].message.content
-            if not content:
-                return {"validation_passed": True}  # Default to pass if validation fails
-            
-            return json.loads(content)
-        except Exception as e:
-            print(f"Error in validation LLM call: {e}")
-            return {"validation_passed": True}  # Default to pass if validation fails
+            review = orjson.loads(arguments)
+        except orjson.JSONDecodeError as e:
+            logger.warning("Invalid review response: %s", e)
+            return questions_data, False
+        
+        if review.get("validation_passed", False):
+            return questions_data, True
+        logger.debug("Review found issues: %s", review.get("issues"))
+        refined_sections = review.get("refined_sections")
+        if not refined_sections:
+            return questions_data, False
+        return {"sections": refined_sections}, True
     
-    def _refine_questions(self, questions_data: Dict, validation_result: Dict, context_analysis: Dict) -> Dict:
-        """Refine questions based on validation feedback (LLM Call #3)"""
+    def _passes_local_review(self, all_questions: List[Dict], context_analysis: Dict) -> bool:
+        """Programmatic coverage pre-check; True means the LLM review can be skipped"""
+        required_question_texts = [
+            q["question_text_template"].format(event_name="{{EVENT_NAME}}")
+            for q in context_analysis.get("required_questions", [])
+        ]
+        return passes_coverage_check(
+            all_questions,
+            context_analysis.get("must_have_goals", []),
+            context_analysis.get("interested_goals", []),
+            required_question_texts
+        )
+    
+    async def _review_questions(self, questions_data: Dict, context_analysis: Dict) -> Tuple[Dict, bool]:
+        """
+        Validate questions and refine them if needed in one LLM call (LLM Call #2).
+        Returns (questions_data, reviewed) as _parse_review_arguments does.
+        """
         try:
-            # Format questions for refinement prompt
-            questions_json = json.dumps(questions_data, indent=2)
-            validation_json = json.dumps(validation_result, indent=2)
-            
-            # Format goals by bucket for refinement
-            must_have = context_analysis.get("must_have_goals", [])
-            interested = context_analysis.get("interested_goals", [])
-            
-            goals_text = ""
-            if must_have:
-                goals_text += "MUST HAVE (need 4 questions each):\n"
-                for goal in must_have:
-                    goals_text += f"  - {goal}\n"
-            if interested:
-                goals_text += "INTERESTED TO KNOW (need 2 questions each):\n"
-                for goal in interested:
-                    goals_text += f"  - {goal}\n"
-            if not goals_text:
-                goals_text = "- General pre-event survey"
-            
-            # Get refinement instructions from validation result
-            refinement_instructions = validation_result.get("refinement_instructions", "Fix any issues identified in the validation feedback.")
-            
-            # Build refinement prompt
-            refinement_prompt = self._refinement_prompt_template.format(
-                original_questions=questions_json,
-                validation_feedback=validation_json,
-                refinement_instructions=refinement_instructions,
-                context_topics=goals_text
-            )
-            
-            response = self.client.chat.completions.create(
-                model="gpt-4o",  # Upgraded for better reasoning in refinement
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a survey question refinement expert. Improve questions based on validation feedback. Always respond with valid JSON only."
-                    },
-                    {
-                        "role": "user",
-                        "content": refinement_prompt
-                    }
-                ],
-                response_format={"type": "json_object"},
-                temperature=0.5,
-                max_tokens=8192  # Increased for 25-30 refined questions: ~150 tokens/question × 30 = 4500 + buffer
-            )
-            
-            content = response.choices[0].message.content
-            if not content:
-                return questions_data  # Return original if refinement fails
-            
-            refined_data = self._parse_response(content)
-            return refined_data if refined_data.get("sections") else questions_data
+            response = await self.create_chat_completion(**self._review_request(questions_data, context_analysis))
+            tool_calls = response.choices[0].message.tool_calls
+            return self._parse_review_arguments(tool_calls[0].function.arguments if tool_calls else None, questions_data)
         except Exception as e:
-            print(f"Error in refinement LLM call: {e}")
-            return questions_data  # Return original if refinement fails
+            logger.warning("Error in review LLM call: %s", e)
+            return questions_data, False  # Return original if review fails
     
     def _parse_response(self, content: str) -> Dict:
-        """Parse LLM response and extract questions with sections"""
+        """
+        Parse LLM response (structured output guarantees the {"sections": [...]} shape).
+        A truncated response (e.g. max_tokens reached) keeps the sections that completed.
+        """
         try:
-            # Try to parse as JSON
-            data = json.loads(content)
-            
-            # Check if response has sections structure
-            if "sections" in data:
-                return data  # Return full structure with sections
-            elif "questions" in data:
-                # Legacy format - convert to sections structure
-                return {
-                    "sections": [{
-                        "section_name": "Survey Questions",
-                        "questions": data["questions"]
-                    }]
-                }
-            elif isinstance(data, list):
-                # Legacy format - list of questions
-                return {
-                    "sections": [{
-                        "section_name": "Survey Questions",
-                        "questions": data
-                    }]
-                }
-            else:
-                # Try to extract JSON from markdown code blocks
-                json_match = re.search(r'```(?:json)?\s*(\{.*?\})\s*```', content, re.DOTALL)
-                if json_match:
-                    data = json.loads(json_match.group(1))
-                    if "sections" in data:
-                        return data
-                    elif "questions" in data:
-                        return {
-                            "sections": [{
-                                "section_name": "Survey Questions",
-                                "questions": data["questions"]
-                            }]
-                        }
-        except json.JSONDecodeError:
-            # Try to extract JSON array from text
-            json_match = re.search(r'\[.*\]', content, re.DOTALL)
-            if json_match:
-                try:
-                    questions = json.loads(json_match.group(0))
-                    return {
-                        "sections": [{
-                            "section_name": "Survey Questions",
-                            "questions": questions
-                        }]
-                    }
-                except:
-                    pass
+            data = orjson.loads(content)
+        except orjson.JSONDecodeError as e:
+            parser = _SectionStreamParser()
+            parser.feed(content)
+            if parser.sections:
+                logger.warning("Generation response ended early; keeping %s complete sections", len(parser.sections))
+                return {"sections": parser.sections}
+            logger.warning("Invalid question generation response: %s", e)
+            return {"sections": []}
         
-        # If all parsing fails, return empty structure
-        return {"sections": []}
+        if not isinstance(data, dict) or not isinstance(data.get("sections"), list):
+            return {"sections": []}
+        return data
     
     def _validate_questions(self, questions: List[Dict]) -> List[Dict]:
         """Validate and normalize question structure, filter demographics and forbidden patterns"""
-        valid_types = ["text", "textarea", "Single-select", "Multi-select", "Likert"]
         validated = []
         
-        # Get universal question texts for deduplication
-        universal_question_texts = get_universal_question_texts()
-        universal_texts_lower = [q.lower() for q in universal_question_texts]
-        
-        # Phrases to detect demographic questions (more specific to avoid false positives)
-        demographic_phrases = [
-            "your name", "your email", "your phone", "your age", 
-            "email address", "phone number",
-            "how old are you", "what is your age",
-            "where do you live", "where did you grow up", 
-            "home base", "currently live", "your location",
-            "your occupation", "what do you do for work",
-        ]
-
         for i, q in enumerate(questions):
             if not isinstance(q, dict):
                 continue
 
-            question_text = q.get("question_text", "").strip()
+            question_text = (q.get("question_text") or "").strip()
             if not question_text:
                 continue
 
@@ -529,36 +1078,35 @@ class LLMService:
             question_text_lower = question_text.lower()
 
             # Check for exact matches with universal questions
-            if question_text_lower in universal_texts_lower:
-                print(f"Warning: Removed duplicate demographic question: {question_text}")
+            if question_text_lower in UNIVERSAL_TEXTS_LOWER:
+                logger.info("Removed duplicate demographic question: %s", question_text)
                 continue
 
             # Check for demographic phrase matches (more specific than single keywords)
-            if any(phrase in question_text_lower for phrase in demographic_phrases):
-                print(f"Warning: Removed demographic question (phrase match): {question_text}")
+            if DEMOGRAPHIC_PHRASES_RE.search(question_text_lower):
+                logger.info("Removed demographic question (phrase match): %s", question_text)
                 continue
             
             # Check for forbidden patterns (post-event questions in pre-event survey)
             if is_forbidden_question(question_text):
-                print(f"Warning: Removed forbidden question (pre-event rule): {question_text}")
+                logger.info("Removed forbidden question (pre-event rule): %s", question_text)
                 continue
             
             question_type = q.get("question_type", "text")
-            if question_type not in valid_types:
+            if question_type not in VALID_QUESTION_TYPES:
                 question_type = "text"
             
             options = q.get("options")
-            if question_type in ["Single-select", "Multi-select", "Likert"]:
+            if question_type in OPTION_QUESTION_TYPES:
                 if not options or not isinstance(options, list):
                     # Convert to text if options missing
                     question_type = "text"
                     options = None
                 elif question_type == "Likert":
                     # Ensure Likert has standard 5-point scale
-                    likert_scale = ["Strongly Disagree", "Disagree", "Neutral", "Agree", "Strongly Agree"]
-                    if options != likert_scale:
+                    if options != _LIKERT_SCALE:
                         # Use standard scale if provided options don't match
-                        options = likert_scale
+                        options = list(_LIKERT_SCALE)
             else:
                 options = None
             
@@ -685,7 +1233,6 @@ class LLMService:
     def _get_fallback_questions(self, context: Dict[str, str]) -> List[Dict]:
         """Return pre-event appropriate fallback questions if LLM fails"""
         event_name = context.get("event_name", "this event")
-        likert_scale = ["Strongly Disagree", "Disagree", "Neutral", "Agree", "Strongly Agree"]
         
         # Get required questions from question bank
         required_questions = get_required_questions()
@@ -702,108 +1249,34 @@ class LLMService:
                 "order": i
             })
         
+        # Fresh dicts/option lists per call so callers can't mutate the shared templates
         start_order = len(fallback)
-        
-        # Pre-event appropriate fallback questions
-        pre_event_fallback = [
-            # Expectations (3 questions)
-            {
-                "question_text": f"What are you most looking forward to at {event_name}?",
-                "question_type": "Multi-select",
-                "options": ["Music performances", "Meeting new people", "Food & drinks", "Overall atmosphere", "Discovering new artists", "Dancing"],
-                "required": True,
-                "order": start_order
-            },
-            {
-                "question_text": f"How excited are you about attending {event_name}?",
-                "question_type": "Likert",
-                "options": likert_scale,
-                "required": True,
-                "order": start_order + 1
-            },
-            {
-                "question_text": f"What would make {event_name} a success for you?",
-                "question_type": "textarea",
-                "options": None,
-                "required": False,
-                "order": start_order + 2
-            },
-            # Preferences (3 questions)
-            {
-                "question_text": "What music genres are you most interested in?",
-                "question_type": "Multi-select",
-                "options": ["Electronic/Dance", "Hip-Hop/R&B", "Rock/Alternative", "Pop", "Indie", "House/Techno", "Other"],
-                "required": True,
-                "order": start_order + 3
-            },
-            {
-                "question_text": "What time of day do you prefer to attend events?",
-                "question_type": "Single-select",
-                "options": ["Morning", "Afternoon", "Evening", "Late Night", "No preference"],
-                "required": False,
-                "order": start_order + 4
-            },
-            {
-                "question_text": "How important is the food and beverage selection to your experience?",
-                "question_type": "Likert",
-                "options": likert_scale,
-                "required": False,
-                "order": start_order + 5
-            },
-            # Logistics (3 questions)
-            {
-                "question_text": f"How are you planning to get to {event_name}?",
-                "question_type": "Single-select",
-                "options": ["Driving myself", "Rideshare (Uber/Lyft)", "Public transport", "Walking/Cycling", "Getting dropped off", "Not sure yet"],
-                "required": True,
-                "order": start_order + 6
-            },
-            {
-                "question_text": "What information would be most helpful to receive before the event?",
-                "question_type": "Multi-select",
-                "options": ["Lineup schedule", "Venue map", "Parking details", "Entry procedures", "Food options", "Weather updates"],
-                "required": False,
-                "order": start_order + 7
-            },
-            {
-                "question_text": "Will you be attending alone or with others?",
-                "question_type": "Single-select",
-                "options": ["Alone", "With 1 other person", "With a small group (3-5)", "With a large group (6+)"],
-                "required": False,
-                "order": start_order + 8
-            },
-            # Marketing (2 questions)
-            {
-                "question_text": f"How did you hear about {event_name}?",
-                "question_type": "Single-select",
-                "options": ["Social media", "Friend/Word of mouth", "Email newsletter", "Online ads", "Event listing sites", "Other"],
-                "required": True,
-                "order": start_order + 9
-            },
-            {
-                "question_text": "What made you decide to attend?",
-                "question_type": "Multi-select",
-                "options": ["The lineup", "Price/value", "Venue location", "Friend recommendation", "Past experience with organizer", "FOMO"],
-                "required": False,
-                "order": start_order + 10
-            },
-            # Pricing (2 questions)
-            {
-                "question_text": "How would you rate the ticket price compared to similar events?",
-                "question_type": "Single-select",
-                "options": ["Much better value", "Slightly better value", "About the same", "Slightly more expensive", "Much more expensive"],
-                "required": False,
-                "order": start_order + 11
-            },
-            {
-                "question_text": "What ticket type did you purchase?",
-                "question_type": "Single-select",
-                "options": ["General Admission", "VIP", "Early Bird", "Group Package", "Other"],
-                "required": False,
-                "order": start_order + 12
-            },
-        ]
-        
-        fallback.extend(pre_event_fallback)
+        for i, template in enumerate(_FALLBACK_QUESTION_TEMPLATES):
+            fallback.append({
+                **template,
+                "question_text": template["question_text"].format(event_name=event_name),
+                "options": list(template["options"]) if template["options"] else None,
+                "order": start_order + i
+            })
         return fallback
 
+
+@functools.lru_cache(maxsize=None)
+def get_llm_service() -> LLMService:
+    """
+    Get the shared LLMService instance.
+    Created on first use so the OpenAI client and prompts are reused across requests.
+    Raises ValueError (and caches nothing) if the OpenAI API key is not configured.
+    """
+    return LLMService()
+
+
+async def warm_openai_connection() -> None:
+    """
+    Open a pooled connection to the OpenAI API (DNS + TLS) ahead of the first survey request.
+    Best effort: failures (e.g. no API key configured) are logged and ignored.
+    """
+    try:
+        await asyncio.wait_for(get_llm_service().client.models.list(), timeout=5)
+    except Exception as e:
+        logger.info("Skipped OpenAI connection warm-up: %s", e)
@@ -0,0 +1,181 @@
+"""Exact and semantic cache for generated survey questions"""
+import copy
+import hashlib
+import logging
+import math
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+import orjson
+from openai import AsyncOpenAI
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+
+QUESTION_CACHE_TTL_SECONDS = 86400  # Default; overridable via settings.question_cache_ttl_seconds
+QUESTION_CACHE_MAX_ENTRIES = 10_000  # In-memory exact tier (used when Redis is not configured)
+
+# Semantic tier settings
+SEMANTIC_CACHE_MODEL = "text-embedding-3-small"
+SEMANTIC_CACHE_DIMENSIONS = 256  # Shortened embeddings keep the linear scan cheap
+SEMANTIC_CACHE_THRESHOLD = 0.95  # Cosine similarity needed to reuse another survey's questions
+SEMANTIC_CACHE_MAX_ENTRIES = 1024
+
+_NON_WORD_RE = re.compile(r"[^\w]+")
+
+
+def normalize_cache_text(text: str) -> str:
+    """Lowercase and strip punctuation/extra whitespace so trivially different wording matches"""
+    return _NON_WORD_RE.sub(" ", text.lower()).strip()
+
+
+class QuestionCache:
+    """
+    Two-tier cache in front of the question generation pipeline.
+    The exact tier is keyed by a hash of the scope plus full context, and by a hash of the
+    scope plus normalized context text (Redis when configured, otherwise an
+    in-memory LRU). The optional semantic tier embeds the normalized text and
+    reuses questions from a very similar survey with the same scope.
+    """
+    
+    def __init__(
+        self,
+        client: AsyncOpenAI,
+        redis: Optional[Redis] = None,
+        semantic: bool = False,
+        ttl_seconds: int = QUESTION_CACHE_TTL_SECONDS
+    ):
+        self.client = client
+        self.redis = redis
+        self.semantic = semantic
+        self.ttl_seconds = ttl_seconds
+        # key -> (expires_at, questions), ordered least- to most-recently used
+        self._exact: "OrderedDict[str, Tuple[float, List[Dict]]]" = OrderedDict()
+        # key -> (expires_at, scope, unit embedding, questions)
+        self._semantic: "OrderedDict[str, Tuple[float, str, List[float], List[Dict]]]" = OrderedDict()
+    
+    async def get(
+        self,
+        context: Dict[str, Any],
+        semantic_text: str,
+        scope: str
+    ) -> Tuple[Optional[List[Dict]], Optional[List[float]]]:
+        """
+        Look up cached questions for a context.
+        Returns (questions or None, embedding). The embedding is only computed on an
+        exact-tier miss with the semantic tier enabled; pass it back to set().
+        """
+        for key in self._get_cache_keys(context, semantic_text, scope):
+            questions = await self._get_exact(key)
+            if questions is not None:
+                return questions, None
+        if not self.semantic:
+            return None, None
+        
+        try:
+            embedding = await self._embed(normalize_cache_text(semantic_text))
+        except Exception as e:
+            logger.warning("Failed to embed survey context for semantic cache: %s", e)
+            return None, None
+        return self._get_similar(embedding, scope), embedding
+    
+    async def set(
+        self,
+        context: Dict[str, Any],
+        semantic_text: str,
+        scope: str,
+        questions: List[Dict],
+        embedding: Optional[List[float]] = None
+    ):
+        """Store questions under the context's exact keys (and its embedding, if given)"""
+        keys = self._get_cache_keys(context, semantic_text, scope)
+        key = keys[0]
+        expires_at = time.monotonic() + self.ttl_seconds
+        
+        if self.redis is not None:
+            try:
+                payload = orjson.dumps(questions)
+                async with self.redis.pipeline(transaction=False) as pipe:
+                    for cache_key in keys:
+                        pipe.set(cache_key, payload, ex=self.ttl_seconds)
+                    await pipe.execute()
+            except RedisError as e:
+                logger.warning("Failed to store questions in cache: %s", e)
+        else:
+            for cache_key in keys:
+                self._exact[cache_key] = (expires_at, copy.deepcopy(questions))
+                self._exact.move_to_end(cache_key)
+            while len(self._exact) > QUESTION_CACHE_MAX_ENTRIES:
+                self._exact.popitem(last=False)
+        
+        if embedding is not None:
+            self._semantic[key] = (expires_at, scope, embedding, copy.deepcopy(questions))
+            self._semantic.move_to_end(key)
+            while len(self._semantic) > SEMANTIC_CACHE_MAX_ENTRIES:
+                self._semantic.popitem(last=False)
+    
+    def _get_cache_keys(self, context: Dict[str, Any], semantic_text: str, scope: str) -> List[str]:
+        """Hash the scope plus canonicalized context, then the scope plus normalized context text"""
+        payload = scope.encode() + b"\n" + orjson.dumps(
+            context, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS, default=str
+        )
+        normalized = f"{scope}\n{normalize_cache_text(semantic_text)}".encode()
+        return [
+            f"survey:{hashlib.sha256(payload).hexdigest()}",
+            f"survey:norm:{hashlib.sha256(normalized).hexdigest()}",
+        ]
+    
+    async def _get_exact(self, key: str) -> Optional[List[Dict]]:
+        """Exact-tier lookup"""
+        if self.redis is not None:
+            try:
+                cached = await self.redis.get(key)
+            except RedisError as e:
+                logger.warning("Question cache lookup failed: %s", e)
+                return None
+            return orjson.loads(cached) if cached else None
+        
+        entry = self._exact.get(key)
+        if entry is None:
+            return None
+        expires_at, questions = entry
+        if time.monotonic() > expires_at:
+            del self._exact[key]
+            return None
+        self._exact.move_to_end(key)
+        return copy.deepcopy(questions)
+    
+    async def _embed(self, text: str) -> List[float]:
+        """Embed text as a unit vector"""
+        response = await self.client.embeddings.create(
+            model=SEMANTIC_CACHE_MODEL,
+            input=text,
+            dimensions=SEMANTIC_CACHE_DIMENSIONS
+        )
+        vector = response.data[0].embedding
+        norm = math.sqrt(sum(x * x for x in vector)) or 1.0
+        return [x / norm for x in vector]
+    
+    def _get_similar(self, embedding: List[float], scope: str) -> Optional[List[Dict]]:
+        """Semantic-tier lookup: most similar unexpired entry in the same scope"""
+        now = time.monotonic()
+        best_score = SEMANTIC_CACHE_THRESHOLD
+        best_questions = None
+        for key, (expires_at, entry_scope, vector, questions) in list(self._semantic.items()):
+            if now > expires_at:
+                del self._semantic[key]
+                continue
+            if entry_scope != scope:
+                continue
+            score = sum(a * b for a, b in zip(embedding, vector))
+            if score >= best_score:
+                best_score = score
+                best_questions = questions
+        
+        if best_questions is None:
+            return None
+        logger.debug("Semantic question cache hit (similarity %.3f)", best_score)
+        return copy.deepcopy(best_questions)
@@ -0,0 +1,158 @@
+"""
+Local Coverage Check for Generated Surveys
+
+Cheap, programmatic version of the LLM review call. When a generated survey
+clearly satisfies the review criteria, the review call can be skipped.
+
+The check is deliberately conservative - it only passes a survey when:
+1. The question count is within the survey constraints
+2. No question matches a forbidden (post-event) or demographic pattern
+3. No two questions are duplicates
+4. Every required question is present
+5. Every goal has enough questions resembling its strategy templates, with
+   each question counted towards at most one goal
+
+Anything it cannot verify (e.g. goals without strategies) fails the check,
+so the LLM review still runs.
+"""
+
+import re
+from typing import Dict, FrozenSet, List
+
+from app.services.pre_event_config import (
+    get_bucket_question_counts,
+    get_survey_constraints,
+    is_forbidden_question,
+)
+from app.services.question_strategies import GOAL_STRATEGIES
+from app.services.universal_questions import is_demographic_question
+
+
+# ===========================================
+# TOKENIZATION
+# ===========================================
+
+# Minimum token-set similarity for a question to count towards a goal
+GOAL_MATCH_THRESHOLD = 0.4
+# Minimum token-set similarity for a required question to count as present
+REQUIRED_MATCH_THRESHOLD = 0.7
+
+_PLACEHOLDER_RE = re.compile(r"\{\{[A-Z_]+\}\}")
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+_STOPWORDS = frozenset({
+    "a", "an", "the", "and", "or", "of", "to", "for", "in", "on", "at", "by", "with",
+    "is", "are", "do", "does", "did", "be", "you", "your", "we", "us", "our", "it",
+    "what", "which", "how", "who", "when", "where", "why", "any", "this", "that",
+    "most", "more", "much", "about", "would", "like", "there", "anything", "else",
+})
+
+
+def _tokenize(text: str) -> FrozenSet[str]:
+    """Lowercase content words of a question, ignoring placeholder tokens."""
+    text = _PLACEHOLDER_RE.sub(" ", text).lower()
+    return frozenset(word for word in _WORD_RE.findall(text) if word not in _STOPWORDS)
+
+
+def _similarity(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    """Jaccard similarity of two token sets."""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+# Token sets of every strategy template, per goal (strategies are static)
+_GOAL_TEMPLATE_TOKENS: Dict[str, List[FrozenSet[str]]] = {
+    goal: [_tokenize(s["template"]["question_text"]) for s in config.get("strategies", [])]
+    for goal, config in GOAL_STRATEGIES.items()
+}
+
+
+def _assign_questions_to_goals(
+    goal_slots: List[List[FrozenSet[str]]],
+    question_tokens: List[FrozenSet[str]]
+) -> bool:
+    """
+    Check that every goal slot can be filled by a different question.
+    Bipartite matching (augmenting paths) between slots and matching questions.
+    """
+    candidates = [
+        [
+            q for q, tokens in enumerate(question_tokens)
+            if max(_similarity(tokens, template) for template in templates) >= GOAL_MATCH_THRESHOLD
+        ]
+        for templates in goal_slots
+    ]
+    slot_for_question: Dict[int, int] = {}
+    
+    def assign(slot: int, visited: set) -> bool:
+        for q in candidates[slot]:
+            if q in visited:
+                continue
+            visited.add(q)
+            other = slot_for_question.get(q)
+            if other is None or assign(other, visited):
+                slot_for_question[q] = slot
+                return True
+        return False
+    
+    return all(assign(slot, set()) for slot in range(len(goal_slots)))
+
+
+# ===========================================
+# COVERAGE CHECK
+# ===========================================
+
+def passes_coverage_check(
+    questions: List[Dict],
+    must_have_goals: List[str],
+    interested_goals: List[str],
+    required_question_texts: List[str]
+) -> bool:
+    """
+    Check whether a generated survey clearly meets the review criteria.
+    
+    Args:
+        questions: Flattened generated questions
+        must_have_goals: Goals in must_have bucket
+        interested_goals: Goals in interested bucket
+        required_question_texts: Texts of questions that must be included
+    
+    Returns:
+        True if the survey can skip the LLM review, False if it needs one
+    """
+    constraints = get_survey_constraints()
+    if not constraints["min_questions"] <= len(questions) <= constraints["max_questions"]:
+        return False
+    
+    question_tokens = []
+    seen_texts = set()
+    for q in questions:
+        text = (q.get("question_text") or "").strip() if isinstance(q, dict) else ""
+        if not text or is_forbidden_question(text) or is_demographic_question(text):
+            return False
+        # Duplicates (same wording, or same content words) need the LLM review
+        normalized = " ".join(text.lower().split())
+        tokens = _tokenize(text)
+        if normalized in seen_texts or tokens in question_tokens:
+            return False
+        seen_texts.add(normalized)
+        question_tokens.append(tokens)
+    
+    for required_text in required_question_texts:
+        required_tokens = _tokenize(required_text)
+        if not any(_similarity(required_tokens, tokens) >= REQUIRED_MATCH_THRESHOLD for tokens in question_tokens):
+            return False
+    
+    bucket_counts = get_bucket_question_counts()
+    goal_targets = [(goal, bucket_counts["must_have"]) for goal in must_have_goals]
+    goal_targets += [(goal, bucket_counts["interested"]) for goal in interested_goals]
+    # One slot per question a goal needs; each question may fill only one slot
+    goal_slots = []
+    for goal, target in goal_targets:
+        templates = _GOAL_TEMPLATE_TOKENS.get(goal)
+        if not templates:
+            return False
+        goal_slots.extend([templates] * target)
+    
+    return _assign_questions_to_goals(goal_slots, question_tokens)
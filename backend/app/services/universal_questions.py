@@ -1,3 +1,4 @@
+import re
 from typing import Dict, List
 
 UNIVERSAL_QUESTIONS = {
@@ -58,6 +59,26 @@ def get_universal_question_texts() -> List[str]:
     return [q["question_text"] for q in UNIVERSAL_QUESTIONS.values()]
 
 
+# Post-generation demographic filter (universal questions already collect these)
+UNIVERSAL_TEXTS_LOWER = frozenset(q_text.lower() for q_text in get_universal_question_texts())
+# Phrases to detect demographic questions (more specific than single keywords to avoid false positives)
+DEMOGRAPHIC_PHRASES = [
+    "your name", "your email", "your phone", "your age",
+    "email address", "phone number",
+    "how old are you", "what is your age",
+    "where do you live", "where did you grow up",
+    "home base", "currently live", "your location",
+    "your occupation", "what do you do for work",
+]
+DEMOGRAPHIC_PHRASES_RE = re.compile("|".join(map(re.escape, DEMOGRAPHIC_PHRASES)))
+
+
+def is_demographic_question(question_text: str) -> bool:
+    """Check if a generated question duplicates what the universal questions collect"""
+    question_text_lower = question_text.strip().lower()
+    return question_text_lower in UNIVERSAL_TEXTS_LOWER or bool(DEMOGRAPHIC_PHRASES_RE.search(question_text_lower))
+
+
 def get_universal_questions(panorama_id: str, config: dict) -> List[Dict]:
     """
     Generate universal questions based on panorama config.